@@ -8,15 +8,22 @@ Searches and manages packages using the NixOS search API
 """
 
 import asyncio
+import importlib.util
 import json
 import os
-import re
+import shutil
 import subprocess
+import time
+import uuid
+from collections import OrderedDict, deque
 from pathlib import Path
 from typing import Optional
 from urllib.parse import quote
 
 import httpx
+from rich.console import Group
+from rich.style import Style
+from rich.text import Text
 from textual.app import App, ComposeResult
 from textual.containers import Container, Horizontal, Vertical, VerticalScroll
 from textual.widgets import (
@@ -34,10 +41,51 @@ from textual.widgets import (
 from textual.binding import Binding
 from textual.reactive import reactive
 
+# Optional, HTTP/2 needs h2; without it httpx pools HTTP/1.1 connections
+HAS_H2 = importlib.util.find_spec("h2") is not None
+
+try:
+    import orjson
+except ImportError:  # Optional, faster JSON decoding
+    orjson = None
+
+try:
+    import ijson
+except ImportError:  # Optional, incremental parsing of search responses
+    ijson = None
+
 
 # Configuration
 MANAGED_FLAKE_DIR = Path.home() / ".demod-nixpkgs" / "managed-packages"
 MANAGED_PACKAGES_FILE = MANAGED_FLAKE_DIR / "packages.nix"
+MANAGED_FLAKE_FILE = MANAGED_FLAKE_DIR / "flake.nix"
+MANAGED_REL_STR = str(MANAGED_FLAKE_DIR.relative_to(Path.home()))
+# Written once the managed flake is set up; bump when the templates change
+MANAGED_VERIFIED_FILE = MANAGED_FLAKE_DIR / ".demod_verified"
+MANAGED_TEMPLATE_VERSION = "1"
+
+# NixOS search API
+SEARCH_API_BASE = "https://search.nixos.org"
+SEARCH_API_PATH = "/backend/latest-42-nixos-unstable/_msearch"
+SEARCH_PAGE_SIZE = 20  # Results in the first page, painted immediately
+ROW_LOAD_MARGIN = 5  # Load the next page when the cursor gets this close to the end
+SEARCH_MAX_RESULTS = 50  # Total results fetched per query
+# Stable per-process routing so Elasticsearch reuses its shard request cache
+SEARCH_PREFERENCE = uuid.uuid4().hex
+# Only the fields the results table and details pane actually render
+SEARCH_SOURCE_FIELDS = [
+    "package_attr_name",
+    "package_pversion",
+    "package_description",
+    "package_programs",
+    "package_homepage",
+    "package_license",
+    "package_platforms",
+]
+SEARCH_CACHE_MAX = 64  # Number of distinct queries kept in memory
+SEARCH_CACHE_TTL = 300.0  # Seconds before a cached result is refetched
+DETAILS_CACHE_MAX = 256  # Rendered package detail views kept in memory
+SEARCH_DEBOUNCE = 0.25  # Seconds of typing inactivity before searching
 
 # Branding
 APP_NAME = "DeMoD Nixpkgs"
@@ -45,6 +93,97 @@ APP_VERSION = "1.0.0"
 APP_TAGLINE = "Beautiful Package Management for Nix"
 
 
+def _parse_categories(text: str) -> dict[str, tuple[int, int]]:
+    """Locate each top-level `<name> = with pkgs; [ ... ];` list in packages.nix
+
+    Returns the (start, end) offsets of each list's contents between the
+    brackets. Runs in a single pass with no backtracking, skipping strings
+    and comments so brackets inside them are ignored.
+    """
+    spans = {}
+    recent = deque(maxlen=5)  # Last tokens seen outside any list
+    depth = 0
+    current = None
+    start = 0
+    i, n = 0, len(text)
+    while i < n:
+        c = text[i]
+        if c.isspace():
+            i += 1
+        elif c == "#":
+            i = text.find("\n", i)
+            if i == -1:
+                break
+        elif text.startswith("/*", i):
+            i = text.find("*/", i + 2)
+            if i == -1:
+                break
+            i += 2
+        elif c == '"':
+            i += 1
+            while i < n and text[i] != '"':
+                i += 2 if text[i] == "\\" else 1
+            i += 1
+            if depth == 0:
+                recent.append('"')
+        elif text.startswith("''", i):
+            i += 2
+            while i < n and not text.startswith("''", i):
+                i += 1
+            while i < n and text.startswith(("'''", "''$", "''\\"), i):
+                # Escape sequences, not the end of the string
+                i += 3
+                while i < n and not text.startswith("''", i):
+                    i += 1
+            i += 2
+            if depth == 0:
+                recent.append("''")
+        elif c.isalpha() or c == "_":
+            j = i + 1
+            while j < n and (text[j].isalnum() or text[j] in "_'-"):
+                j += 1
+            if depth == 0:
+                recent.append(text[i:j])
+            i = j
+        elif c == "[":
+            if depth == 0 and len(recent) == 5 and list(recent)[1:] == ["=", "with", "pkgs", ";"]:
+                current = recent[0]
+                start = i + 1
+            depth += 1
+            i += 1
+        elif c == "]":
+            depth = max(depth - 1, 0)
+            if depth == 0 and current is not None:
+                spans[current] = (start, i)
+                current = None
+            i += 1
+        else:
+            if depth == 0:
+                recent.append(c)
+            i += 1
+    return spans
+
+
+# ijson prefixes for hits and per-query errors in an _msearch response
+_HIT_PREFIX = "responses.item.hits.hits.item"
+_ERROR_PREFIX = "responses.item.error"
+
+
+class _AsyncByteReader:
+    """Minimal async file-like wrapper over an async bytes iterator, for ijson"""
+
+    def __init__(self, chunks):
+        self._chunks = chunks
+
+    async def read(self, size: int = -1) -> bytes:
+        if size == 0:  # ijson probes with read(0) to detect bytes vs str
+            return b""
+        async for chunk in self._chunks:
+            if chunk:
+                return chunk
+        return b""
+
+
 class BrandedHeader(Static):
     """Custom branded header with logo"""
 
@@ -57,8 +196,29 @@ class BrandedHeader(Static):
 class PackageDetails(Static):
     """Widget to display detailed package information with enhanced styling"""
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._details_cache: OrderedDict[str, Group] = OrderedDict()
+
     def update_package(self, package: dict) -> None:
         """Update the displayed package details"""
+        details = package.get("_rendered_details")
+        if details is None:
+            # Not prerendered yet, fall back to the memoized live build
+            key = f"{package.get('package_attr_name', '')}@{package.get('package_pversion', '')}"
+            details = self._details_cache.get(key)
+            if details is None:
+                details = self.render_details(package)
+                self._details_cache[key] = details
+                if len(self._details_cache) > DETAILS_CACHE_MAX:
+                    self._details_cache.popitem(last=False)
+            else:
+                self._details_cache.move_to_end(key)
+        self.update(details)
+
+    @staticmethod
+    def render_details(package: dict) -> Group:
+        """Build the styled renderable for a package's details view"""
         name = package.get("package_attr_name", "N/A")
         version = package.get("package_pversion", "N/A")
         description = package.get("package_description", "No description available")
@@ -82,34 +242,37 @@ class PackageDetails(Static):
 
         homepage_str = homepage[0] if isinstance(homepage, list) and homepage else str(homepage)
 
-        # Enhanced details with better formatting
-        details = f"""[bold #00d4ff]┌─ Package Information ─────────────────────────────────────┐[/bold #00d4ff]
-
-[bold #00d4ff]Package:[/bold #00d4ff]     [bold white]{name}[/bold white]
-[bold #00d4ff]Version:[/bold #00d4ff]     [#88ff88]{version}[/#88ff88]
-
-[bold #00d4ff]Description:[/bold #00d4ff]
-  [dim]{description}[/dim]
-
-[bold #00d4ff]Programs:[/bold #00d4ff]    {programs_str}
-[bold #00d4ff]License:[/bold #00d4ff]     {license_str}
-[bold #00d4ff]Platforms:[/bold #00d4ff]   {platforms_str}
-[bold #00d4ff]Homepage:[/bold #00d4ff]    [link={homepage_str}]{homepage_str}[/link]
-
-[bold #00d4ff]┌─ Installation ────────────────────────────────────────────┐[/bold #00d4ff]
-
-[bold #ffaa00]Direct Install:[/bold #ffaa00]
-  [dim]$[/dim] nix profile install nixpkgs#{name}
-
-[bold #ffaa00]Flake Usage:[/bold #ffaa00]
-  environment.systemPackages = [ pkgs.{name.split('.')[-1]} ];
-
-[bold #ffaa00]Shell Environment:[/bold #ffaa00]
-  [dim]$[/dim] nix shell nixpkgs#{name}
-
-[bold #00d4ff]└───────────────────────────────────────────────────────────┘[/bold #00d4ff]
-"""
-        self.update(details)
+        # Styled directly rather than as markup, so showing it needs no parsing
+        accent = "bold #00d4ff"
+        heading = "bold #ffaa00"
+        details = Group(
+            Text("┌─ Package Information ─────────────────────────────────────┐", accent),
+            Text(),
+            Text.assemble(("Package:", accent), "     ", (str(name), "bold white")),
+            Text.assemble(("Version:", accent), "     ", (str(version), "#88ff88")),
+            Text(),
+            Text("Description:", accent),
+            Text.assemble("  ", (str(description), "dim")),
+            Text(),
+            Text.assemble(("Programs:", accent), "    ", programs_str),
+            Text.assemble(("License:", accent), "     ", license_str),
+            Text.assemble(("Platforms:", accent), "   ", platforms_str),
+            Text.assemble(("Homepage:", accent), "    ", (homepage_str, Style(link=homepage_str))),
+            Text(),
+            Text("┌─ Installation ────────────────────────────────────────────┐", accent),
+            Text(),
+            Text("Direct Install:", heading),
+            Text.assemble("  ", ("$", "dim"), f" nix profile install nixpkgs#{name}"),
+            Text(),
+            Text("Flake Usage:", heading),
+            Text(f"  environment.systemPackages = [ pkgs.{name.split('.')[-1]} ];"),
+            Text(),
+            Text("Shell Environment:", heading),
+            Text.assemble("  ", ("$", "dim"), f" nix shell nixpkgs#{name}"),
+            Text(),
+            Text("└───────────────────────────────────────────────────────────┘", accent),
+        )
+        return details
 
 
 class StatusBar(Static):
@@ -118,22 +281,35 @@ class StatusBar(Static):
     package_count = reactive(0)
     search_query = reactive("")
     
+    _STATUS_PREFIX = "[#00d4ff]●[/#00d4ff] Connected to NixOS API"
+    _STATUS_SUFFIX = f"  │  [dim]Managed:[/dim] ~/[dim]{MANAGED_REL_STR}[/dim]"
+    _last_status = ""
+    
     def watch_package_count(self, count: int) -> None:
         self.update_status()
     
     def watch_search_query(self, query: str) -> None:
         self.update_status()
     
+    def set_stats(self, query: str, count: int) -> None:
+        """Update the query and result count together with a single refresh"""
+        with self.app.batch_update():
+            self.search_query = query
+            self.package_count = count
+    
     def update_status(self) -> None:
-        status = f"[#00d4ff]●[/#00d4ff] Connected to NixOS API"
+        segments = [self._STATUS_PREFIX]
         if self.search_query:
-            status += f"  │  [dim]Query:[/dim] [bold]{self.search_query}[/bold]"
+            segments.append(f"  │  [dim]Query:[/dim] [bold]{self.search_query}[/bold]")
         if self.package_count > 0:
-            status += f"  │  [dim]Results:[/dim] [bold #88ff88]{self.package_count}[/bold #88ff88]"
-        
-        managed_path = f"[dim]{MANAGED_FLAKE_DIR.relative_to(Path.home())}[/dim]"
-        status += f"  │  [dim]Managed:[/dim] ~/{managed_path}"
+            segments.append(f"  │  [dim]Results:[/dim] [bold #88ff88]{self.package_count}[/bold #88ff88]")
+        segments.append(self._STATUS_SUFFIX)
         
+        status = "".join(segments)
+        # Skip Textual's re-render when nothing visible changed
+        if status == self._last_status:
+            return
+        self._last_status = status
         self.update(status)
 
 
@@ -287,18 +463,63 @@ class DeMoDNixpkgs(App):
         Binding("s", "focus_search", "Search", show=True, key_display="S"),
         Binding("i", "install_package", "Install", show=True, key_display="I"),
         Binding("a", "add_to_managed", "Add to Managed", show=True, key_display="A"),
+        Binding("c", "install_and_copy", "Install + Copy", show=True, key_display="C"),
         Binding("r", "refresh", "Refresh", show=True, key_display="R"),
         Binding("?", "show_help", "Help", show=False, key_display="?"),
     ]
 
+    # Category emoji mapping
+    _CATEGORY_EMOJI = {
+        "development": "💻",
+        "productivity": "📊",
+        "media": "🎨",
+        "utilities": "🔧",
+        "custom": "⭐",
+    }
+
     def __init__(self):
         super().__init__()
         self.current_packages = []
         self.selected_package = None
-        self.ensure_managed_flake_exists()
+        # Last read packages.nix content, keyed by its mtime
+        self._managed_cache: Optional[tuple[Path, int, str]] = None
+        # Clipboard command resolved once, None when no tool is installed
+        self._clipboard_cmd: Optional[list[str]] = self._find_clipboard_cmd()
+        # Recent search results: normalized query -> (fetched_at, packages)
+        self._search_cache: OrderedDict[str, tuple[float, list]] = OrderedDict()
+        # Pending debounced search and the search currently in flight
+        self._search_handle: Optional[asyncio.TimerHandle] = None
+        self._search_task: Optional[asyncio.Task] = None
+        # Shared client so repeated searches reuse pooled connections
+        self._http = httpx.AsyncClient(
+            base_url=SEARCH_API_BASE,
+            http2=HAS_H2,
+            timeout=10.0,
+            limits=httpx.Limits(max_keepalive_connections=4, keepalive_expiry=60),
+        )
+        # Set once the managed flake has been created in the background
+        self._flake_ready = asyncio.Event()
+
+    @staticmethod
+    def _find_clipboard_cmd() -> Optional[list[str]]:
+        """Locate a clipboard tool, preferring wl-copy on Wayland"""
+        wl_copy = shutil.which("wl-copy")
+        xclip = shutil.which("xclip")
+        if wl_copy and (os.environ.get("WAYLAND_DISPLAY") or not xclip):
+            return [wl_copy]
+        if xclip:
+            return [xclip, "-selection", "clipboard"]
+        return None
 
     def ensure_managed_flake_exists(self) -> None:
         """Ensure the managed packages flake directory and files exist"""
+        # Already set up by this template version, skip all other filesystem work
+        try:
+            if MANAGED_VERIFIED_FILE.read_text(errors="ignore") == MANAGED_TEMPLATE_VERSION:
+                return
+        except OSError:
+            pass
+
         MANAGED_FLAKE_DIR.mkdir(parents=True, exist_ok=True)
         
         # Copy template files if they don't exist
@@ -334,10 +555,9 @@ class DeMoDNixpkgs(App):
 """)
         
         # Copy flake.nix if it doesn't exist
-        flake_file = MANAGED_FLAKE_DIR / "flake.nix"
+        flake_file = MANAGED_FLAKE_FILE
         if not flake_file.exists():
             if template_dir.exists() and (template_dir / "flake.nix").exists():
-                import shutil
                 shutil.copy(template_dir / "flake.nix", flake_file)
             else:
                 # Create minimal flake
@@ -388,28 +608,68 @@ class DeMoDNixpkgs(App):
 }
 """)
 
+        MANAGED_VERIFIED_FILE.write_text(MANAGED_TEMPLATE_VERSION)
+
+    def _ensure_flake_worker(self) -> None:
+        """Create the managed flake in a worker thread, then signal readiness"""
+        try:
+            self.ensure_managed_flake_exists()
+        except OSError as e:
+            self.call_from_thread(
+                self.notify,
+                f"Error creating managed packages flake: {str(e)}",
+                severity="error",
+                timeout=10,
+            )
+        finally:
+            self.call_from_thread(self._flake_ready.set)
+
     def add_package_to_managed(self, package_name: str, category: str = "custom") -> bool:
         """Add a package to the managed packages.nix file"""
         try:
-            content = MANAGED_PACKAGES_FILE.read_text()
+            # Files deleted after setup was verified: drop the marker and recreate them
+            if not MANAGED_PACKAGES_FILE.exists() or not MANAGED_FLAKE_FILE.exists():
+                MANAGED_VERIFIED_FILE.unlink(missing_ok=True)
+                self.ensure_managed_flake_exists()
+
+            # Edit the real file, so a symlinked packages.nix stays a symlink
+            target = MANAGED_PACKAGES_FILE.resolve()
+            target_stat = target.stat()
+            cache = self._managed_cache
+            if cache and cache[0] == target and cache[1] == target_stat.st_mtime_ns:
+                content = cache[2]
+            else:
+                content = target.read_text()
+                self._managed_cache = (target, target_stat.st_mtime_ns, content)
             
             # Find the category section
-            category_pattern = rf"({category}\s*=\s*with pkgs;\s*\[)(.*?)(\];)"
-            match = re.search(category_pattern, content, re.DOTALL)
-            
-            if not match:
+            span = _parse_categories(content).get(category)
+            if span is None:
                 return False
-            
+            start, end = span
+            packages_section = content[start:end]
+
             # Check if package already exists in this category
-            packages_section = match.group(2)
-            if package_name in packages_section:
-                return False  # Already exists
-            
-            # Add the package (uncommented)
-            new_packages = packages_section.rstrip() + f"\n    {package_name}"
-            new_content = content[:match.start(2)] + new_packages + content[match.end(2):]
-            
-            MANAGED_PACKAGES_FILE.write_text(new_content)
+            for line in packages_section.splitlines():
+                if package_name in line.split("#", 1)[0].split():
+                    return False  # Already exists
+
+            # Add the package (uncommented) after the last entry, before "];"
+            body = packages_section.rstrip()
+            new_content = (
+                content[:start] + body + f"\n    {package_name}"
+                + packages_section[len(body):] + content[end:]
+            )
+
+            # Write atomically so a crash can't leave a truncated packages.nix
+            tmp_file = target.with_name(target.name + ".tmp")
+            with open(tmp_file, "w") as f:
+                f.write(new_content)
+                f.flush()
+                os.fsync(f.fileno())
+            os.chmod(tmp_file, target_stat.st_mode)
+            os.replace(tmp_file, target)
+            self._managed_cache = (target, target.stat().st_mtime_ns, new_content)
             return True
             
         except Exception as e:
@@ -457,6 +717,9 @@ class DeMoDNixpkgs(App):
 
     def on_mount(self) -> None:
         """Set up the data table when the app starts"""
+        # Create the managed flake off the startup path so the UI paints first
+        self.run_worker(self._ensure_flake_worker, thread=True, exclusive=True)
+
         table = self.query_one("#results-table", DataTable)
         table.add_columns("Package", "Version", "Description")
         table.cursor_type = "row"
@@ -468,13 +731,59 @@ class DeMoDNixpkgs(App):
         status = self.query_one("#status-bar", StatusBar)
         status.update_status()
 
-    async def on_input_submitted(self, event: Input.Submitted) -> None:
-        """Handle search when Enter is pressed"""
-        if event.input.id == "search-input":
-            await self.search_packages(event.value)
+    async def on_unmount(self) -> None:
+        """Close the shared HTTP client when the app shuts down"""
+        await self._http.aclose()
+
+    def on_input_changed(self, event: Input.Changed) -> None:
+        """Search as the user types, once typing pauses"""
+        if event.input.id != "search-input":
+            return
+
+        if not event.value.strip():
+            # Query deleted: stop any search for text that is no longer there
+            self._cancel_search()
+            return
+
+        if self._search_handle:
+            self._search_handle.cancel()
+        self._search_handle = asyncio.get_running_loop().call_later(
+            SEARCH_DEBOUNCE, self._start_search, event.value
+        )
 
-    async def search_packages(self, query: str) -> None:
-        """Search for packages using the NixOS search API"""
+    def on_input_submitted(self, event: Input.Submitted) -> None:
+        """Handle search when Enter is pressed, skipping the debounce"""
+        if event.input.id == "search-input":
+            self._start_search(event.value, notify=True)
+
+    def _cancel_search(self) -> None:
+        """Cancel any pending debounced search and any search in flight"""
+        if self._search_handle:
+            self._search_handle.cancel()
+            self._search_handle = None
+
+        if self._search_task and not self._search_task.done():
+            self._search_task.cancel()
+        self._search_task = None
+
+    def _start_search(
+        self, query: str, use_cache: bool = True, notify: bool = False
+    ) -> asyncio.Task:
+        """Start a search, cancelling any pending or in-flight one"""
+        self._cancel_search()
+        self._search_task = asyncio.create_task(
+            self.search_packages(query, use_cache, notify)
+        )
+        return self._search_task
+
+    async def search_packages(
+        self, query: str, use_cache: bool = True, notify: bool = True
+    ) -> None:
+        """Search for packages using the NixOS search API
+
+        With notify=False (live search while typing) the progress toasts are
+        skipped; failures and empty results are still reported.
+        """
         if not query.strip():
             return
 
@@ -482,66 +791,50 @@ class DeMoDNixpkgs(App):
         table.clear()
         self.current_packages = []
 
-        # Update status bar
+        # Update status bar; the table was just cleared
         status = self.query_one("#status-bar", StatusBar)
-        status.search_query = query
+        status.set_stats(query, 0)
 
         # Show loading notification
-        self.notify(f"🔍 Searching for '{query}'...", timeout=2)
+        if notify:
+            self.notify(f"🔍 Searching for '{query}'...", timeout=2)
 
         try:
-            async with httpx.AsyncClient() as client:
-                url = "https://search.nixos.org/backend/latest-42-nixos-unstable/_search"
-                
-                # Construct the search query for NixOS API
-                search_body = {
-                    "from": 0,
-                    "size": 50,
-                    "query": {
-                        "bool": {
-                            "must": [
-                                {
-                                    "multi_match": {
-                                        "query": query,
-                                        "fields": [
-                                            "package_attr_name^3",
-                                            "package_programs^2",
-                                            "package_pname^2",
-                                            "package_description",
-                                        ],
-                                    }
-                                }
-                            ],
-                            "filter": [{"term": {"type": {"value": "package"}}}],
-                        }
-                    },
-                    "sort": [{"_score": "desc"}, {"package_attr_name": "asc"}],
-                }
-
-                response = await client.post(url, json=search_body, timeout=10.0)
-                response.raise_for_status()
-                data = response.json()
-
-                hits = data.get("hits", {}).get("hits", [])
-                self.current_packages = [hit["_source"] for hit in hits]
-
-                if not self.current_packages:
-                    self.notify("❌ No packages found", severity="warning", timeout=3)
-                    status.package_count = 0
-                    return
-
-                # Populate the table
-                for pkg in self.current_packages:
-                    name = pkg.get("package_attr_name", "N/A")
-                    version = pkg.get("package_pversion", "N/A")
-                    description = pkg.get("package_description", "")
-                    # Truncate long descriptions
-                    if len(description) > 60:
-                        description = description[:57] + "..."
-
-                    table.add_row(name, version, description)
-
-                status.package_count = len(self.current_packages)
+            cache_key = query.strip().lower()
+            cached = self._search_cache.get(cache_key)
+            if use_cache and cached is not None and time.monotonic() - cached[0] < SEARCH_CACHE_TTL:
+                self._search_cache.move_to_end(cache_key)
+                self.current_packages = cached[1]
+            else:
+                # Fill the table as hits arrive rather than after the whole body
+                self.current_packages = []
+                async for pkg in self._stream_packages(query):
+                    self.current_packages.append(pkg)
+                    if table.row_count < SEARCH_PAGE_SIZE:
+                        self._load_more_rows(table)
+                    if len(self.current_packages) % 10 == 0:
+                        await asyncio.sleep(0)  # Let the renderer catch up
+
+                # Build the details views in a worker thread, off the UI loop
+                asyncio.get_running_loop().run_in_executor(
+                    None, self._prerender_details, self.current_packages
+                )
+                self._search_cache[cache_key] = (time.monotonic(), self.current_packages)
+                self._search_cache.move_to_end(cache_key)
+                if len(self._search_cache) > SEARCH_CACHE_MAX:
+                    self._search_cache.popitem(last=False)
+
+            if not self.current_packages:
+                self.notify("❌ No packages found", severity="warning", timeout=3)
+                status.package_count = 0
+                return
+
+            # Populate the first page; the rest loads as the cursor nears the end
+            if table.row_count < SEARCH_PAGE_SIZE:
+                self._load_more_rows(table)
+
+            status.package_count = len(self.current_packages)
+            if notify:
                 self.notify(
                     f"✅ Found {len(self.current_packages)} packages",
                     severity="information",
@@ -550,15 +843,130 @@ class DeMoDNixpkgs(App):
 
         except httpx.HTTPError as e:
             self.notify(f"❌ Search failed: {str(e)}", severity="error", timeout=5)
+            # Drop rows already streamed in so partial results can't be installed
+            table.clear()
+            self.current_packages = []
             status.package_count = 0
         except Exception as e:
             self.notify(f"❌ Error: {str(e)}", severity="error", timeout=5)
+            table.clear()
+            self.current_packages = []
             status.package_count = 0
 
+    async def _stream_packages(self, query: str):
+        """Yield matching packages from the NixOS search API as they arrive
+
+        Both result pages are requested in a single _msearch round-trip.
+        """
+        # Construct the search query for NixOS API
+        search_query = {
+            "bool": {
+                "must": [
+                    {
+                        "multi_match": {
+                            "query": query,
+                            "fields": [
+                                "package_attr_name^3",
+                                "package_programs^2",
+                                "package_pname^2",
+                                "package_description",
+                            ],
+                        }
+                    }
+                ],
+                "filter": [{"term": {"type": {"value": "package"}}}],
+            }
+        }
+        sort = [{"_score": "desc"}, {"package_attr_name": "asc"}]
+        pages = [
+            (0, SEARCH_PAGE_SIZE),
+            (SEARCH_PAGE_SIZE, SEARCH_MAX_RESULTS - SEARCH_PAGE_SIZE),
+        ]
+
+        lines = []
+        for start, size in pages:
+            lines.append(json.dumps({"preference": SEARCH_PREFERENCE}))
+            lines.append(json.dumps({
+                "from": start,
+                "size": size,
+                "query": search_query,
+                "sort": sort,
+                "_source": SEARCH_SOURCE_FIELDS,
+                "track_total_hits": False,
+            }))
+
+        async with self._http.stream(
+            "POST",
+            SEARCH_API_PATH,
+            content="\n".join(lines) + "\n",
+            headers={"Content-Type": "application/x-ndjson"},
+        ) as response:
+            response.raise_for_status()
+
+            if ijson:
+                # Build each hit, or a sub-response's error, as soon as it ends
+                events = ijson.parse(_AsyncByteReader(response.aiter_bytes()), use_float=True)
+                builder = target = None
+                async for prefix, event, value in events:
+                    if builder is None:
+                        if prefix not in (_HIT_PREFIX, _ERROR_PREFIX):
+                            continue
+                        if event not in ("start_map", "start_array"):
+                            if prefix == _ERROR_PREFIX:
+                                raise RuntimeError(f"Search backend error: {value}")
+                            continue
+                        builder, target = ijson.ObjectBuilder(), prefix
+                    builder.event(event, value)
+                    if prefix == target and event in ("end_map", "end_array"):
+                        if target == _ERROR_PREFIX:
+                            raise RuntimeError(f"Search backend error: {builder.value}")
+                        yield builder.value["_source"]
+                        builder = None
+                return
+
+            await response.aread()
+            data = orjson.loads(response.content) if orjson else response.json()
+
+        for result in data.get("responses", []):
+            if "error" in result:
+                raise RuntimeError(f"Search backend error: {result['error']}")
+            for hit in result.get("hits", {}).get("hits", []):
+                yield hit["_source"]
+
+    @staticmethod
+    def _prerender_details(packages: list) -> None:
+        """Render and attach the details view for each package"""
+        for pkg in packages:
+            if "_rendered_details" not in pkg:
+                pkg["_rendered_details"] = PackageDetails.render_details(pkg)
+
+    def _load_more_rows(self, table: DataTable) -> None:
+        """Add the next page of current_packages to the results table"""
+        start = table.row_count
+        for index in range(start, min(start + SEARCH_PAGE_SIZE, len(self.current_packages))):
+            pkg = self.current_packages[index]
+            name = pkg.get("package_attr_name", "N/A")
+            version = pkg.get("package_pversion", "N/A")
+            description = pkg.get("package_description", "")
+            # Truncate long descriptions
+            if len(description) > 60:
+                description = description[:57] + "..."
+
+            table.add_row(name, version, description, key=str(index))
+
+    def on_data_table_row_highlighted(self, event: DataTable.RowHighlighted) -> None:
+        """Load more results when the cursor approaches the last loaded row"""
+        table = event.data_table
+        if (
+            table.row_count < len(self.current_packages)
+            and event.cursor_row >= table.row_count - ROW_LOAD_MARGIN
+        ):
+            self._load_more_rows(table)
+
     def on_data_table_row_selected(self, event: DataTable.RowSelected) -> None:
         """Handle row selection in the results table"""
         if event.row_key.value is not None:
-            row_index = event.row_key.value
+            row_index = int(event.row_key.value)
             if 0 <= row_index < len(self.current_packages):
                 self.selected_package = self.current_packages[row_index]
                 
@@ -579,13 +987,13 @@ class DeMoDNixpkgs(App):
         elif event.button.id == "flake-btn":
             await self.add_to_flake()
         elif event.button.id == "clear-btn":
+            self._cancel_search()
             self.query_one("#search-input", Input).value = ""
             table = self.query_one("#results-table", DataTable)
             table.clear()
             self.current_packages = []
             status = self.query_one("#status-bar", StatusBar)
-            status.search_query = ""
-            status.package_count = 0
+            status.set_stats("", 0)
 
     async def action_add_to_managed(self) -> None:
         """Add the selected package to managed packages"""
@@ -598,23 +1006,17 @@ class DeMoDNixpkgs(App):
         
         # Get selected category
         category_select = self.query_one("#category-select", Select)
-        category = str(category_select.value)
+        category = category_select.value  # allow_blank=False, always a str
+        emoji = self._CATEGORY_EMOJI.get(category, "📦")
         
-        # Category emoji mapping
-        category_emoji = {
-            "development": "💻",
-            "productivity": "📊",
-            "media": "🎨",
-            "utilities": "🔧",
-            "custom": "⭐"
-        }
-        emoji = category_emoji.get(category, "📦")
+        # Wait for the managed flake to be created on first launch
+        await self._flake_ready.wait()
         
         # Add to managed packages
         if self.add_package_to_managed(pkg_name, category):
             self.notify(
                 f"✅ Added {pkg_name} to {emoji} {category}\n"
-                f"📁 Location: ~/{MANAGED_FLAKE_DIR.relative_to(Path.home())}",
+                f"📁 Location: ~/{MANAGED_REL_STR}",
                 severity="information",
                 timeout=5
             )
@@ -631,15 +1033,29 @@ class DeMoDNixpkgs(App):
             self.notify("⚠️  Please select a package first", severity="warning", timeout=3)
             return
 
-        name = self.selected_package.get("package_attr_name", "")
+        await self._nix_install(self.selected_package.get("package_attr_name", ""))
+
+    async def _nix_install(self, name: str) -> None:
+        """Install a package into the user's Nix profile"""
         self.notify(f"⚡ Installing {name}...", timeout=3)
 
+        # Enable flakes for this call without relying on the user's nix.conf
+        nix_config = os.environ.get("NIX_CONFIG", "")
+        env = {
+            **os.environ,
+            "NIX_CONFIG": f"{nix_config}\nextra-experimental-features = nix-command flakes",
+        }
+
         try:
-            # Run nix profile install
+            # Run nix profile install, without rewriting any lock file
             process = await asyncio.create_subprocess_exec(
-                "nix", "profile", "install", f"nixpkgs#{name}",
+                "nix", "profile", "install",
+                "--no-write-lock-file",
+                "--print-build-logs",
+                f"nixpkgs#{name}",
                 stdout=asyncio.subprocess.PIPE,
                 stderr=asyncio.subprocess.PIPE,
+                env=env,
             )
             stdout, stderr = await process.communicate()
 
@@ -650,9 +1066,10 @@ class DeMoDNixpkgs(App):
                     timeout=5
                 )
             else:
-                error_msg = stderr.decode() if stderr else "Unknown error"
+                # Build logs come first, the actual error is at the end
+                error_msg = stderr.decode().strip() if stderr else "Unknown error"
                 self.notify(
-                    f"❌ Installation failed:\n{error_msg[:200]}",
+                    f"❌ Installation failed:\n{error_msg[-200:]}",
                     severity="error",
                     timeout=10
                 )
@@ -672,35 +1089,28 @@ class DeMoDNixpkgs(App):
             self.notify("⚠️  Please select a package first", severity="warning", timeout=3)
             return
 
-        name = self.selected_package.get("package_attr_name", "")
+        await self._copy_flake_entry(self.selected_package)
+
+    async def _copy_flake_entry(self, package: dict) -> None:
+        """Copy a package's flake.nix entry to the clipboard, or show it"""
+        name = package.get("package_attr_name", "")
         pkg_name = name.split(".")[-1]  # Get the last part for pkgs.X
 
-        flake_entry = f'    pkgs.{pkg_name}  # {self.selected_package.get("package_description", "")[:50]}'
+        flake_entry = f'    pkgs.{pkg_name}  # {package.get("package_description", "")[:50]}'
         
-        # Try to copy to clipboard if xclip or wl-copy is available
+        # Copy to clipboard if xclip or wl-copy is available
         clipboard_success = False
-        try:
-            # Try xclip first (X11)
-            process = await asyncio.create_subprocess_exec(
-                "xclip", "-selection", "clipboard",
-                stdin=asyncio.subprocess.PIPE,
-                stdout=asyncio.subprocess.DEVNULL,
-                stderr=asyncio.subprocess.DEVNULL,
-            )
-            await process.communicate(flake_entry.encode())
-            clipboard_success = True
-        except FileNotFoundError:
+        if self._clipboard_cmd:
             try:
-                # Try wl-copy (Wayland)
                 process = await asyncio.create_subprocess_exec(
-                    "wl-copy",
+                    *self._clipboard_cmd,
                     stdin=asyncio.subprocess.PIPE,
                     stdout=asyncio.subprocess.DEVNULL,
                     stderr=asyncio.subprocess.DEVNULL,
                 )
                 await process.communicate(flake_entry.encode())
-                clipboard_success = True
-            except FileNotFoundError:
+                clipboard_success = process.returncode == 0
+            except OSError:
                 pass
         
         if clipboard_success:
@@ -717,6 +1127,18 @@ class DeMoDNixpkgs(App):
                 timeout=8
             )
 
+    async def action_install_and_copy(self) -> None:
+        """Copy the flake entry and install the selected package concurrently"""
+        if not self.selected_package:
+            self.notify("⚠️  Please select a package first", severity="warning", timeout=3)
+            return
+
+        package = self.selected_package
+        await asyncio.gather(
+            self._copy_flake_entry(package),
+            self._nix_install(package.get("package_attr_name", "")),
+        )
+
     def action_focus_search(self) -> None:
         """Focus the search input"""
         self.query_one("#search-input", Input).focus()
@@ -725,7 +1147,7 @@ class DeMoDNixpkgs(App):
         """Refresh the current search"""
         search_input = self.query_one("#search-input", Input)
         if search_input.value:
-            asyncio.create_task(self.search_packages(search_input.value))
+            self._start_search(search_input.value, use_cache=False, notify=True)
         else:
             self.notify("ℹ️  Enter a search query first", severity="information", timeout=2)
 
@@ -738,6 +1160,7 @@ class DeMoDNixpkgs(App):
   S - Focus search
   I - Install selected package
   A - Add to managed packages
+  C - Install and copy flake entry
   R - Refresh search
   Q - Quit
 
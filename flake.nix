@@ -14,6 +14,9 @@
         pythonEnv = pkgs.python3.withPackages (ps: with ps; [
           textual
           httpx
+          h2
+          orjson
+          ijson
         ]);
 
         demod-nixpkgs = pkgs.writeScriptBin "demod-nixpkgs" ''